@@ -1,9 +1,25 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import requests
+import html
 import json
 import re
+import textwrap
 from cohere import Client
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
 
 API_KEY = st.secrets["COHERE_API_KEY"]
 
@@ -12,14 +28,103 @@ st.set_page_config(page_title="NCAAM Summarizer", page_icon="🏀")
 # -----------------------------
 # FUNCTIONS
 # -----------------------------
+def _cacheable_response(response):
+    """
+    requests-cache filter: summary responses are stored with NEVER_EXPIRE,
+    so refuse to cache any whose game isn't completed yet — otherwise an
+    in-progress payload would be frozen on disk and the game stuck
+    incomplete until the cache file is deleted.
+    """
+    if "/summary" in response.url:
+        try:
+            return _is_completed_game(_read_json(response))
+        except Exception:
+            return False
+    return True
+
+@st.cache_resource
+def _espn_session():
+    """
+    One shared Session for all ESPN calls: keep-alive reuses the TCP/TLS
+    connection across requests, and transient 5xx/429 responses are retried
+    with backoff instead of surfacing to the user.
+    """
+    retries = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retries)
+    if requests_cache is not None:
+        # HTTP-level disk cache under the st.cache_data layer: teams and
+        # schedules expire daily, completed-game summary responses are
+        # immutable and never expire
+        session = requests_cache.CachedSession(
+            ".espn_cache",
+            expire_after=86400,
+            allowable_codes=(200,),
+            urls_expire_after={
+                "*/summary*": requests_cache.NEVER_EXPIRE,
+                # Schedules must refresh hourly so newly completed games
+                # show up; keep in step with the load_team_events TTL
+                "*/schedule*": 3600,
+            },
+            filter_fn=_cacheable_response,
+        )
+    else:
+        session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def _read_json(response):
+    """Parse a response body with orjson when available (noticeably faster on
+    the large summary payloads), falling back to requests' stdlib parser."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+@st.cache_resource
+def _fetch_pool():
+    """Small shared pool for firing ESPN requests in parallel."""
+    return ThreadPoolExecutor(max_workers=4)
+
+def prefetch_games(game_ids, limit=5):
+    """
+    Kick off background fetches for the games the user is most likely to pick
+    (the most recent ones), so load_game_from_espn is usually a cache hit by
+    the time they click. Futures live in session_state to avoid resubmitting.
+    """
+    futures = st.session_state.setdefault("prefetch_futures", {})
+    for gid in list(game_ids)[-limit:]:
+        if gid not in futures:
+            futures[gid] = _fetch_pool().submit(load_game_from_espn, gid)
+
+@st.cache_data(ttl=86400, persist="disk", show_spinner=False)
 def get_teams():
     url = "http://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/teams?limit=400"
-    response = requests.get(url)
+    response = _espn_session().get(url, timeout=5)
     response.raise_for_status()
-    data = response.json()
+    data = _read_json(response)
     teams = data['sports'][0]['leagues'][0]['teams']
-    df_teams = pd.json_normalize(teams)
-    return df_teams[['team.id', 'team.displayName']]
+    # Pluck the two fields we use directly; json_normalize would flatten
+    # every nested attribute (logos, colors, ...) just to throw them away
+    return pd.DataFrame(
+        [
+            {
+                'team.id': t['team']['id'],
+                'team.displayName': t['team']['displayName'],
+            }
+            for t in teams
+        ]
+    )
+
+@st.cache_data(show_spinner=False)
+def team_name_to_id():
+    """Display name -> team id map, so selection is a dict lookup instead of
+    a boolean mask over the teams frame on every rerun."""
+    df_teams = get_teams()
+    return dict(zip(df_teams["team.displayName"], df_teams["team.id"]))
 
 def get_games(target_team_id, selected_season_year):
     """
@@ -28,111 +133,110 @@ def get_games(target_team_id, selected_season_year):
     """
 
     def fetch_schedule(url):
-        response = requests.get(url)
+        response = _espn_session().get(url, timeout=5)
         response.raise_for_status()
-        data = response.json()
-        events = data.get("events", [])
-        return pd.json_normalize(events)
+        data = _read_json(response)
+        return data.get("events", [])
 
     # -----------------------------
-    # Fetch regular season
+    # Fetch regular season and postseason in parallel — both calls are pure
+    # network wait, so wall-clock is max(RTTs) instead of their sum
     # -----------------------------
     reg_url = (
         f"http://site.api.espn.com/apis/site/v2/sports/basketball/"
         f"mens-college-basketball/teams/{target_team_id}/schedule"
         f"?season={selected_season_year}"
     )
-    df_reg = fetch_schedule(reg_url)
-
-    # -----------------------------
-    # Fetch postseason
-    # -----------------------------
     post_url = (
         f"http://site.api.espn.com/apis/site/v2/sports/basketball/"
         f"mens-college-basketball/teams/{target_team_id}/schedule"
         f"?season={selected_season_year}&seasontype=3"
     )
-    df_post = fetch_schedule(post_url)
+    reg_future = _fetch_pool().submit(fetch_schedule, reg_url)
+    post_future = _fetch_pool().submit(fetch_schedule, post_url)
+    reg_events = reg_future.result()
+    post_events = post_future.result()
 
     # -----------------------------
-    # Combine + de-duplicate
+    # Filter to completed games first, then parse only the survivors
     # -----------------------------
-    df_events = pd.concat([df_reg, df_post], ignore_index=True)
+    events = [
+        e for e in reg_events + post_events
+        if isinstance(e.get("competitions"), list)
+        and e["competitions"]
+        and e["competitions"][0].get("status", {}).get("type", {}).get("completed") is True
+    ]
 
-    if df_events.empty:
-        return df_events
+    our_id = str(target_team_id)
+    records = []
+    seen = set()  # postseason games can appear in both feeds
 
-    # De-duplicate by ESPN event id
-    if "id" in df_events.columns:
-        df_events = df_events.drop_duplicates(subset="id")
+    for event in events:
+        event_id = str(event.get("id"))
+        if event_id in seen:
+            continue
+        seen.add(event_id)
 
-    # -----------------------------
-    # Keep completed games only
-    # -----------------------------
-    df_events = df_events[
-        df_events["competitions"].apply(
-            lambda comps: (
-                isinstance(comps, list)
-                and len(comps) > 0
-                and comps[0]
-                .get("status", {})
-                .get("type", {})
-                .get("completed") is True
-            )
-        )
-    ].copy()
-
-    if df_events.empty:
-        return df_events
-
-    # -----------------------------
-    # Parse results
-    # -----------------------------
-    def parse_row(row):
-        comps = row["competitions"]
-        if not isinstance(comps, list) or len(comps) == 0:
-            return pd.Series(
-                {"result": None, "opponent_name": None, "score_str": None}
-            )
+        comp = event["competitions"][0]
 
-        competitors = comps[0].get("competitors", [])
-        our_id = str(target_team_id)
+        competitors = comp.get("competitors", [])
 
         our_score = 0
         opp_score = 0
         opponent_name = None
         our_winner = False
 
-        for c in competitors:
-            team_obj = c.get("team", {})
-            team_id = str(team_obj.get("id", ""))
-            score_val = c.get("score", {}).get("value", 0)
-
-            if team_id == our_id:
-                our_score = int(score_val or 0)
-                our_winner = c.get("winner", False)
-            else:
-                opp_score = int(score_val or 0)
-                opponent_name = team_obj.get("displayName")
-
-        score_str = f"{our_score}–{opp_score}"
-        result = "Win" if our_winner else "Loss"
-
-        return pd.Series(
+        if len(competitors) == 2:
+            # The common case: unpack the pair directly instead of branching
+            # on the team id twice inside a loop
+            a, b = competitors
+            ours, theirs = (a, b) if str(a.get("team", {}).get("id")) == our_id else (b, a)
+            our_score = int(ours.get("score", {}).get("value") or 0)
+            our_winner = ours.get("winner", False)
+            opp_score = int(theirs.get("score", {}).get("value") or 0)
+            opponent_name = theirs.get("team", {}).get("displayName")
+        else:
+            # Odd payloads (forfeits, malformed entries): generic fallback
+            for c in competitors:
+                team_obj = c.get("team", {})
+                team_id = str(team_obj.get("id", ""))
+                score_val = c.get("score", {}).get("value", 0)
+
+                if team_id == our_id:
+                    our_score = int(score_val or 0)
+                    our_winner = c.get("winner", False)
+                else:
+                    opp_score = int(score_val or 0)
+                    opponent_name = team_obj.get("displayName")
+
+        records.append(
             {
-                "result": result,
+                "id": event_id,
+                "date": event.get("date"),
+                "our_score": our_score,
+                "opp_score": opp_score,
+                "our_winner": bool(our_winner),
                 "opponent_name": opponent_name,
-                "score_str": score_str,
             }
         )
 
-    parsed = df_events.apply(parse_row, axis=1)
-    df_events = pd.concat([df_events, parsed], axis=1)
+    df_events = pd.DataFrame.from_records(records)
+
+    if df_events.empty:
+        return df_events
 
     # -----------------------------
-    # Display fields
+    # Display fields (vectorized over the whole column)
     # -----------------------------
-    df_events["display_date"] = pd.to_datetime(df_events["date"]).dt.strftime("%Y-%m-%d")
+    df_events["result"] = np.where(df_events["our_winner"], "Win", "Loss")
+    df_events["score_str"] = (
+        df_events["our_score"].astype(str) + "–" + df_events["opp_score"].astype(str)
+    )
+
+    df_events["display_date"] = (
+        pd.to_datetime(df_events["date"], format="ISO8601", utc=True)
+        .dt.strftime("%Y-%m-%d")
+    )
 
     df_events["option_name"] = (
         df_events["display_date"]
@@ -143,27 +247,134 @@ def get_games(target_team_id, selected_season_year):
         + ")"
     )
 
-    df_events["id"] = df_events["id"].astype(str)
-
     return df_events
 
-def load_game_from_espn(game_id: str):
+# Shorter TTL than the static caches: recent games flip to completed
+@st.cache_data(ttl=3600, persist="disk", show_spinner=False)
+def load_team_events(team_id, season_year):
+    return get_games(team_id, season_year)
+
+# Same TTL as load_team_events: this is its only caller, so without one the
+# schedule would never be re-fetched while the process lives
+@st.cache_data(ttl=3600, show_spinner=False)
+def build_game_options(team_id, season_year):
+    """
+    Build the selectbox options and id -> pretty-label map for a team's games.
+    Cached so the label formatting doesn't rerun on every widget interaction.
+    """
+    display_map = {"none": "Select a game..."}
+    options = ["none"]  # first option selects nothing
+
+    df_events = load_team_events(team_id, season_year)
+    if df_events is None or df_events.empty:
+        return options, display_map
+
+    # "YYYY-MM-DD • Opponent • SCORE • 🟢 Win/🔴 Loss", built column-wise
+    ids = df_events["id"].astype(str).to_numpy()
+    badges = np.where(df_events["result"].to_numpy() == "Win", "🟢 Win", "🔴 Loss")
+    labels = (
+        df_events["display_date"]
+        + " • "
+        + df_events["opponent_name"]
+        + " • "
+        + df_events["score_str"]
+        + " • "
+        + badges
+    ).to_numpy()
+    display_map.update(zip(ids, labels))
+    options.extend(ids)
+
+    return options, display_map
+
+def _fetch_game_uncached(game_id: str):
     url = f"http://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/summary?event={game_id}"
-    response = requests.get(url)
+    response = _espn_session().get(url, timeout=5)
     response.raise_for_status()
-    return response.json()
+    return _read_json(response)
+
+def _is_completed_game(data):
+    try:
+        return data["header"]["competitions"][0]["status"]["type"]["completed"] is True
+    except (KeyError, IndexError, TypeError):
+        return False
+
+@st.cache_data(persist="disk", show_spinner=False)
+def _load_completed_game(game_id: str):
+    """
+    Cached with no TTL: once a game is completed its summary JSON is
+    immutable. Raises for in-progress games so nothing stale is stored.
+    """
+    data = _fetch_game_uncached(game_id)
+    if not _is_completed_game(data):
+        raise ValueError(f"game {game_id} is not completed yet")
+    return data
+
+def load_game_from_espn(game_id: str):
+    try:
+        return _load_completed_game(game_id)
+    except ValueError:
+        # Live/future game: always serve a fresh, uncached payload
+        return _fetch_game_uncached(game_id)
+
+# Keys that never belong in the prompt: link/article noise the model is told
+# to ignore anyway. Pruned recursively before serialization.
+_PRUNE_KEYS = {"href", "links", "logos", "article", "news", "videos"}
+
+def _strip_noise(obj, keys=_PRUNE_KEYS):
+    """Recursively drop pruned keys from nested dicts/lists."""
+    if isinstance(obj, dict):
+        return {k: _strip_noise(v, keys) for k, v in obj.items() if k not in keys}
+    if isinstance(obj, list):
+        return [_strip_noise(v, keys) for v in obj]
+    return obj
+
+# The only play fields the prompt actually reasons about; everything else
+# (ids, sequence numbers, participant refs, coordinates) just burns tokens.
+_PLAY_KEYS = ("period", "clock", "scoringPlay", "scoreValue", "text", "homeScore", "awayScore")
+
+def _compress_game_data(data, team_name):
+    """Project the bulky sections down to what the prompt needs. Plays keep
+    only salient fields, the boxscore keeps only the analyzed team's player
+    stats, and leader entries lose headshot imagery."""
+    if isinstance(data.get("plays"), list):
+        # Downsample before projecting fields: scoring plays carry the run/
+        # momentum information the prompt asks about, and overtime (period 3+
+        # in the men's college game) is kept in full. Routine non-scoring
+        # possessions just inflate the token count.
+        plays = [
+            p for p in data["plays"]
+            if p.get("scoringPlay") or (p.get("period") or {}).get("number", 0) >= 3
+        ]
+        data["plays"] = [{k: p.get(k) for k in _PLAY_KEYS} for p in plays]
+
+    boxscore = data.get("boxscore")
+    if isinstance(boxscore, dict) and isinstance(boxscore.get("players"), list):
+        ours = [
+            p for p in boxscore["players"]
+            if p.get("team", {}).get("displayName") == team_name
+        ]
+        if ours:
+            boxscore["players"] = ours
+
+    if "leaders" in data:
+        data["leaders"] = _strip_noise(data["leaders"], keys={"headshot", "flag"})
+
+    return data
 
 def safe_dump(section, name):
     if section is None:
         return f"\n=== {name} (MISSING) ===\n"
-    compact = json.dumps(section, separators=(',', ':'))
+    if orjson is not None:
+        compact = orjson.dumps(section).decode()
+    else:
+        compact = json.dumps(section, separators=(',', ':'))
     return f"\n=== {name} ===\n{compact}\n"
 
-def render_card(title, content, bg_color="#f0f0f0", is_html=False):
-    """Render a full-width card. If is_html=True, content is injected as raw HTML."""
-    inner = content if is_html else f"<pre style='white-space:pre-wrap'>{st.Markdown(str(content))}</pre>"
-    # Note: when is_html is False above we just show content via Markdown fallback; we won't use that path much.
-    html = f"""
+def _card_html(title, content, bg_color="#f0f0f0", is_html=False):
+    """Build the HTML for one full-width card. If is_html=True, content is
+    injected as raw HTML; otherwise it is escaped and shown preformatted."""
+    inner = content if is_html else f"<pre style='white-space:pre-wrap'>{html.escape(str(content))}</pre>"
+    return f"""
     <div style="
         background-color: {bg_color};
         border-radius: 10px;
@@ -171,16 +382,157 @@ def render_card(title, content, bg_color="#f0f0f0", is_html=False):
         margin-bottom: 15px;
     ">
         <h3 style="margin-top:0;">{title}</h3>
-        {content}
+        {inner}
     </div>
     """
-    st.markdown(html, unsafe_allow_html=True)
+
+def render_card(title, content, bg_color="#f0f0f0", is_html=False):
+    """Render a single full-width card."""
+    st.markdown(_card_html(title, content, bg_color, is_html), unsafe_allow_html=True)
+
+# Compiled once at import; matches <h2>Title</h2> followed by its body
+_SECTION_RE = re.compile(r"<h2>(.*?)<\/h2>\s*(.*?)(?=<h2>|$)", re.DOTALL)
 
 def split_sections(html_text):
     """Extract sections from model HTML output (<h2>Title</h2> ...)."""
-    pattern = r"<h2>(.*?)<\/h2>\s*(.*?)(?=<h2>|$)"
-    matches = re.findall(pattern, html_text, flags=re.DOTALL)
-    return {title.strip(): body.strip() for title, body in matches}
+    return {title.strip(): body.strip() for title, body in _SECTION_RE.findall(html_text)}
+
+# Constant prompt preamble; only the game data and team name vary per call.
+# Bump prompt_version in summarize_game when editing this.
+_PROMPT_TEMPLATE = textwrap.dedent("""\
+    You are an ex-college basketball coach with over 30 years of experience coaching Division 1 basketball. During your tenure as a coach, you compiled a winning record of 902 wins to 371 losses, won 3 national championships, and went undefeated one year with a perfect 32-0 record and a national championship.
+
+    Below is structured JSON game data (header, boxscore, leaders, plays, etc.) The 'article' field was removed entirely. Ignore all recap text that might have existed originally. Use ONLY the structured stats, box scores, plays, scoring data, and leaders. Ignore any links to external articles. When writing your response, think about how your prior role as a successful college basketball coach would influence your interpretation of the data.
+
+    ------------------- BEGIN GAME DATA -------------------
+    {game_data_block}
+    ------------------- END GAME DATA ---------------------
+
+    TASK: Analyze {team_name}'s performance and produce the following sections in clean HTML. Only talk about {team_name} even if they lost the game. Center your narrative on {team_name}.
+
+    Each section has explicit content instructions:
+
+    # Game Summary
+    - A concise narrative of how the game unfolded.
+    - Focus on flow, momentum swings, and what decided the game.
+    - Call out a specific moment or play which may have shifted the momentum in the game from one team to the other.
+    - Who won the jump ball is not important.
+    - Utilizing the play-by-play data in <plays>, determine important game trends or shifts in momentum
+    - Use ONLY stats and play data; do NOT invent events.
+
+    # The Good
+    - Bullet points.
+    - Identify players who performed well.
+    - Highlight positive trends, efficiency, hustle plays, defensive success, shooting, rebounding, etc.
+    - Use stats to justify claims.
+
+    # The Bad
+    - Bullet points.
+    - Identify players who struggled.
+    - Highlight negative trends: turnovers, poor shooting, foul trouble, defensive breakdowns, etc.
+    - Use stats to justify claims.
+
+    # The Mixed
+    - Bullet points.
+    - Call out players or aspects of the team that showed both strengths and weaknesses.
+    - Use stats to illustrate nuance.
+
+    # Interesting Stats
+    - Bullet points.
+    - Pull specific numerical facts from the JSON: shooting splits, runs, rebounding margins, leader stats, etc.
+    - Must be factual, drawn directly from the data.
+
+    # Key Players
+    - Bullet points.
+    - Based on leaders, boxscore performance, and play impact.
+    - Should include a brief justification for why each player stands out.
+    # Game Notes
+    - Bullet points.
+    - These are coaching notes: things the team or specific players must improve moving forward.
+    - Speak as the head coach: focus on adjustments, discipline, execution, decision-making, effort, etc.
+
+    # RULES:
+    - DO NOT invent stats.
+    - Do not use any article/recap text.
+    - Ground everything in the JSON provided.
+    - If data is missing, say so.
+
+    # OUTPUT FORMAT (CRITICAL):
+    - Return ONLY valid HTML (no code fences or backticks).
+    - Use clean, semantic HTML tags such as:
+    - <div>, <p>, <h2>, <h3>, <ul>, <li>, <strong>, <em>
+
+    STRUCTURE REQUIREMENTS:
+    - <h2>Game Summary</h2> <div> ... summary content ... </div>
+    - <h2>The Good</h2> <ul><li>...</li></ul>
+    - <h2>The Mixed</h2> <ul><li>...</li></ul>
+    - <h2>The Bad</h2> <ul><li>...</li></ul>
+    - <h2>Interesting Stats</h2> <ul><li>...</li></ul>
+    - <h2>Key Players</h2> <ul><li>...</li></ul>
+    - <h2>Game Notes</h2> <ul><li>...</li></ul>
+
+    IMPORTANT:
+    - Bullet lists MUST be valid <ul><li>...</li></ul> lists.
+    - No Markdown is allowed.
+    - No surrounding code blocks.
+    - Do not add CSS or styling; just structural HTML.
+    - Do not add extra sections.
+    - Keep structure exactly as above.
+    - Do not explain your formatting.
+""").strip()
+
+@st.cache_resource
+def get_cohere_client():
+    return Client(API_KEY)
+
+@st.cache_data(ttl=7 * 86400, show_spinner=False)
+def summarize_game(game_id, team_name, prompt_version="v1", _placeholder=None):
+    """
+    Build the prompt for one game and stream the Cohere response, returning
+    the full HTML text. Tokens are rendered into _placeholder as they arrive
+    (ignored by the cache key, hence the underscore). Cached on
+    (game_id, team_name, prompt_version) so repeated clicks are free;
+    bump prompt_version when the prompt template changes to invalidate entries.
+    """
+    # Prune links/article/news noise from the dict before serialization, so
+    # the serializer never emits it and no regex pass over the text is needed
+    data = _compress_game_data(_strip_noise(load_game_from_espn(game_id)), team_name)
+
+    # Build clean JSON text to send to model
+    parts = [
+        safe_dump(data.get(field), field.upper())
+        for field in ["header", "boxscore", "leaders", "gameInfo", "plays", "scoring"]
+    ]
+    clean_text = "".join(parts)
+
+    # Put your exact prompt here — keep the HTML output requirement
+    prompt = _PROMPT_TEMPLATE.format(
+        team_name=team_name,
+        game_data_block=clean_text,
+    )
+
+    co = get_cohere_client()
+    stream = co.chat_stream(
+        model="command-a-03-2025",
+        message=prompt,
+        temperature=0.2,
+        max_tokens=2500
+    )
+
+    full = ""
+    shown = 0
+    for event in stream:
+        if event.event_type == "text-generation":
+            full += event.text
+            if _placeholder is not None:
+                # Render only fully-closed sections (everything before the
+                # most recent <h2>), so whole sections appear as they finish
+                # instead of a flickering partial tail re-painting per token
+                matches = list(_SECTION_RE.finditer(full))
+                if len(matches) > 1 and matches[-1].start() > shown:
+                    shown = matches[-1].start()
+                    _placeholder.markdown(full[:shown], unsafe_allow_html=True)
+    return full
 
 @st.cache_data
 def load_seasons():
@@ -189,46 +541,42 @@ def load_seasons():
         "?sport=basketball&league=mens-college-basketball"
         "&region=us&lang=en&contentorigin=espn&startingseason=2002"
     )
-    r = requests.get(url)
+    r = _espn_session().get(url, timeout=5)
     r.raise_for_status()
-    return r.json()
-
-def parse_seasons(json_data):
-    seasons = json_data.get("seasons", [])
-    # Example output often contains a list of dicts with "year" and "displayName"
-    # but you should inspect the real structure with `st.write(json_data)` once
-    season_list = [
-        {
-            "year": s.get("year"),
-            "displayName": s.get("displayName", str(s.get("year"))),
-        }
-        for s in seasons
-    ]
-    return pd.DataFrame(season_list)
+    return _read_json(r)
+
+@st.cache_data(show_spinner=False)
+def season_options():
+    """
+    Season display names sorted most-recent-first, plus a name -> year map.
+    A couple dozen seasons don't need a DataFrame; a sorted list and dict
+    make the per-rerun selectbox and year lookup free.
+    """
+    seasons = load_seasons().get("seasons", [])
+    pairs = sorted(
+        ((s.get("year"), s.get("displayName", str(s.get("year")))) for s in seasons),
+        key=lambda p: p[0] or 0,
+        reverse=True,
+    )
+    names = [name for _, name in pairs]
+    name_to_year = {name: year for year, name in pairs}
+    return names, name_to_year
 
 # -----------------------------
 # MAIN APP
 # -----------------------------
 st.title("College Basketball Summarizer")
 
-# Load seasons
-seasons_json = load_seasons()
-df_seasons = parse_seasons(seasons_json)
-
-# Sort so most recent season is first
-df_seasons = df_seasons.sort_values("year", ascending=False).reset_index(drop=True)
-
-# Default to the most recent season (index 0)
+# Load seasons (most recent first); default to the most recent (index 0)
+season_names, season_name_to_year = season_options()
 selected_season_display = st.selectbox(
     "Select a season:",
-    df_seasons["displayName"].tolist(),
+    season_names,
     index=0
 )
 
 # Store the selected season year for later use
-selected_season_year = df_seasons.loc[
-    df_seasons["displayName"] == selected_season_display, "year"
-].iloc[0]
+selected_season_year = season_name_to_year[selected_season_display]
 
 st.write(
     f"Selected season: **{selected_season_display}** "
@@ -242,28 +590,14 @@ selected_team_name = st.selectbox("Select a team:", team_names, index=0)
 
 # When a team is chosen, load that team's completed games
 if selected_team_name != "Select a team...":
-    team_id = df_teams.loc[df_teams["team.displayName"] == selected_team_name, "team.id"].iloc[0]
-
-    @st.cache_data
-    def load_team_events_cached(team_id, selected_season_year):
-        return get_games(team_id, selected_season_year)
+    team_id = team_name_to_id()[selected_team_name]
 
-    df_events = load_team_events_cached(team_id, selected_season_year)
+    # Options list and id -> pretty label "YYYY-MM-DD • Opponent • SCORE • 🟢 Win/🔴 Loss"
+    options, display_map = build_game_options(team_id, selected_season_year)
 
-    if df_events is None or df_events.empty:
+    if len(options) == 1:
         st.warning("No completed games found for this team.")
     else:
-        # Build display map: id -> pretty label "YYYY-MM-DD • Opponent • SCORE • 🟢 Win/🔴 Loss"
-        display_map = {}
-        options = ["none"]  # first option selects nothing
-        display_map["none"] = "Select a game..."
-        for _, row in df_events.iterrows():
-            gid = str(row["id"])
-            badge = "🟢 Win" if row["result"] == "Win" else "🔴 Loss"
-            label = f"{row['display_date']} • {row['opponent_name']} • {row['score_str']} • {badge}"
-            display_map[gid] = label
-            options.append(gid)
-
         # Selectbox uses the gid values, but shows the pretty label via format_func
         selected_game_id = st.selectbox(
             "Select a game:",
@@ -272,109 +606,15 @@ if selected_team_name != "Select a team...":
             format_func=lambda gid: display_map.get(gid, "Select a game...")
         )
 
+        # Warm the game-summary cache for the most recent games in the background
+        prefetch_games(options[1:])
+
         if selected_game_id != "none":
             # show chosen label
             st.write(f"Selected: **{display_map[selected_game_id]}**")
 
             # Generate summary button
             if st.button("Generate Game Summary"):
-                # Load game JSON
-                data = load_game_from_espn(selected_game_id)
-
-                # Remove text/article fields if present
-                for field in ["article", "news", "videos"]:
-                    if field in data:
-                        del data[field]
-
-                # Build clean JSON text to send to model
-                clean_text = ""
-                for field in ["header", "boxscore", "leaders", "gameInfo", "plays", "scoring"]:
-                    clean_text += safe_dump(data.get(field), field.upper())
-                clean_text = re.sub(r'"href"\s*:\s*"[^"]*"\s*(,)?', "", clean_text)
-
-                # Put your exact prompt here — keep the HTML output requirement
-                prompt = f"""
-                    You are an ex-college basketball coach with over 30 years of experience coaching Division 1 basketball. During your tenure as a coach, you compiled a winning record of 902 wins to 371 losses, won 3 national championships, and went undefeated one year with a perfect 32-0 record and a national championship. 
-
-                                        Below is structured JSON game data (header, boxscore, leaders, plays, etc.) The 'article' field was removed entirely. Ignore all recap text that might have existed originally. Use ONLY the structured stats, box scores, plays, scoring data, and leaders. Ignore any links to external articles. When writing your response, think about how your prior role as a successful college basketball coach would influence your interpretation of the data. 
-
-                                        ------------------- BEGIN GAME DATA ------------------- 
-                                        {clean_text} 
-                                        ------------------- END GAME DATA --------------------- 
-
-                                        TASK: Analyze {selected_team_name}'s performance and produce the following sections in clean HTML. Only talk about {selected_team_name} even if they lost the game. Center your narrative on {selected_team_name}. 
-
-                                        Each section has explicit content instructions: 
-
-                                        # Game Summary
-                                        - A concise narrative of how the game unfolded. 
-                                        - Focus on flow, momentum swings, and what decided the game. 
-                                        - Call out a specific moment or play which may have shifted the momentum in the game from one team to the other. 
-                                        - Who won the jump ball is not important. 
-                                        - Utilizing the play-by-play data in <plays>, determine important game trends or shifts in momentum 
-                                        - Use ONLY stats and play data; do NOT invent events. 
-
-                                        # The Good 
-                                        - Bullet points. 
-                                        - Identify players who performed well. 
-                                        - Highlight positive trends, efficiency, hustle plays, defensive success, shooting, rebounding, etc. 
-                                        - Use stats to justify claims. 
-
-                                        # The Bad 
-                                        - Bullet points. 
-                                        - Identify players who struggled. 
-                                        - Highlight negative trends: turnovers, poor shooting, foul trouble, defensive breakdowns, etc. 
-                                        - Use stats to justify claims. 
-
-                                        # The Mixed 
-                                        - Bullet points. 
-                                        - Call out players or aspects of the team that showed both strengths and weaknesses. 
-                                        - Use stats to illustrate nuance. 
-
-                                        # Interesting Stats 
-                                        - Bullet points. 
-                                        - Pull specific numerical facts from the JSON: shooting splits, runs, rebounding margins, leader stats, etc. 
-                                        - Must be factual, drawn directly from the data. 
-
-                                        # Key Players 
-                                        - Bullet points. 
-                                        - Based on leaders, boxscore performance, and play impact. 
-                                        - Should include a brief justification for why each player stands out. 
-                                        # Game Notes 
-                                        - Bullet points. 
-                                        - These are coaching notes: things the team or specific players must improve moving forward. 
-                                        - Speak as the head coach: focus on adjustments, discipline, execution, decision-making, effort, etc. 
-
-                                        # RULES: 
-                                        - DO NOT invent stats. 
-                                        - Do not use any article/recap text. 
-                                        - Ground everything in the JSON provided. 
-                                        - If data is missing, say so. 
-
-                                        # OUTPUT FORMAT (CRITICAL): 
-                                        - Return ONLY valid HTML (no code fences or backticks). 
-                                        - Use clean, semantic HTML tags such as: 
-                                        - <div>, <p>, <h2>, <h3>, <ul>, <li>, <strong>, <em> 
-
-                                        STRUCTURE REQUIREMENTS: 
-                                        - <h2>Game Summary</h2> <div> ... summary content ... </div> 
-                                        - <h2>The Good</h2> <ul><li>...</li></ul> 
-                                        - <h2>The Mixed</h2> <ul><li>...</li></ul> 
-                                        - <h2>The Bad</h2> <ul><li>...</li></ul> 
-                                        - <h2>Interesting Stats</h2> <ul><li>...</li></ul> 
-                                        - <h2>Key Players</h2> <ul><li>...</li></ul> 
-                                        - <h2>Game Notes</h2> <ul><li>...</li></ul> 
-
-                                        IMPORTANT: 
-                                        - Bullet lists MUST be valid <ul><li>...</li></ul> lists. 
-                                        - No Markdown is allowed. 
-                                        - No surrounding code blocks. 
-                                        - Do not add CSS or styling; just structural HTML. 
-                                        - Do not add extra sections. 
-                                        - Keep structure exactly as above. 
-                                        - Do not explain your formatting.
-"""
-
                 # Spinner
                 spinner = st.empty()
                 spinner.markdown("""
@@ -390,15 +630,14 @@ if selected_team_name != "Select a team...":
                 </div>
                 """, unsafe_allow_html=True)
 
-                # Call Cohere
-                co = Client(API_KEY)
-
+                # Call Cohere (cached, so repeat clicks on the same game are free);
+                # the spinner placeholder fills with text as tokens stream in
                 try:
-                    response = co.chat(
-                        model="command-a-03-2025",
-                        message=prompt,
-                        temperature=0.2,
-                        max_tokens=2500
+                    summary_html = summarize_game(
+                        selected_game_id,
+                        selected_team_name,
+                        prompt_version="v1",
+                        _placeholder=spinner,
                     )
 
                     spinner.empty()
@@ -406,13 +645,13 @@ if selected_team_name != "Select a team...":
                     spinner.empty()
                     st.error(
                      "⚠️ The summary service is temporarily unavailable; someone might be spamming the app and hitting my free cohere limit."
-                    "Please wait a moment and try again."  
+                    "Please wait a moment and try again."
                     )
 
                     st.stop()
 
                 # Parse returned HTML into sections and render
-                sections = split_sections(response.text)
+                sections = split_sections(summary_html)
 
                 # Game Summary
                 render_card("Game Summary", sections.get("Game Summary", ""), bg_color="#e2e3e5", is_html=True)
@@ -426,8 +665,11 @@ if selected_team_name != "Select a team...":
                 with tabs[2]:
                     render_card("The Bad", sections.get("The Bad", ""), bg_color="#f8d7da", is_html=True)
 
-                # Other sections
-                render_card("Interesting Stats", sections.get("Interesting Stats", ""), bg_color="#f0f0f0", is_html=True)
-                render_card("Key Players", sections.get("Key Players", ""), bg_color="#f0f0f0", is_html=True)
-                render_card("Game Notes", sections.get("Game Notes", ""), bg_color="#f0f0f0", is_html=True)
+                # Other sections: one st.markdown (one message to the
+                # browser) instead of three
+                trailing = "".join(
+                    _card_html(title, sections.get(title, ""), bg_color="#f0f0f0", is_html=True)
+                    for title in ["Interesting Stats", "Key Players", "Game Notes"]
+                )
+                st.markdown(trailing, unsafe_allow_html=True)
 